@@ -0,0 +1,102 @@
+"""FreeCADCmd script used by render_views.py to convert STEP files to binary STL.
+
+Run as `FreeCADCmd _fc_export_helper.py <manifest.json>`; the manifest holds the linear
+deflection (or null for bbox diagonal / 1024) and a list of [infile, outfile] pairs.
+"""
+import sys
+import json
+import traceback
+try:
+    import FreeCAD
+except Exception:
+    FreeCAD = None
+try:
+    import Part
+except Exception:
+    Part = None
+try:
+    import Mesh
+except Exception:
+    Mesh = None
+try:
+    import MeshPart
+except Exception:
+    MeshPart = None
+try:
+    import Import
+except Exception:
+    Import = None
+print('fc script argv=', sys.argv)
+with open(sys.argv[-1]) as mf:
+    manifest = json.load(mf)
+jobs = manifest['jobs']
+mesh_prefs = 'User parameter:BaseApp/Preferences/Mod/Mesh'
+# binary STL: several times smaller than ASCII and parsed straight into arrays by trimesh
+try:
+    FreeCAD.ParamGet(mesh_prefs).SetBool('AsciiSTL', False)
+except Exception:
+    pass
+failed = 0
+for infile, outfile in jobs:
+    ok = False
+    shape = None
+    if Part is not None:
+        try:
+            shape = Part.read(infile)
+        except Exception:
+            shape = None
+    # preview tessellation: about one pixel of chord error at 1024px, relative to the part's size
+    deflection = manifest['deflection']
+    if deflection is None and shape is not None:
+        deflection = shape.BoundBox.DiagonalLength / 1024.0
+    if deflection is not None:
+        try:
+            FreeCAD.ParamGet(mesh_prefs).SetFloat('MaxDeviationExport', deflection)
+        except Exception:
+            pass
+    # try Part.read -> MeshPart.meshFromShape
+    if shape is not None and MeshPart is not None:
+        try:
+            mesh = MeshPart.meshFromShape(Shape=shape, LinearDeflection=deflection, AngularDeflection=0.5)
+            mesh.write(outfile, 'STL')
+            ok = True
+        except Exception:
+            pass
+    # try Import.open -> Mesh.export
+    if not ok and Import is not None:
+        try:
+            objs = Import.open(infile)
+            try:
+                Mesh.export(objs, outfile)
+                ok = True
+            except Exception:
+                pass
+        except Exception:
+            pass
+    # try Import into doc
+    if not ok:
+        try:
+            try:
+                doc = FreeCAD.newDocument()
+            except Exception:
+                import App
+                doc = App.newDocument()
+            Import.open(infile, doc.Name)
+            objs = doc.Objects
+            Mesh.export(objs, outfile)
+            ok = True
+        except Exception:
+            traceback.print_exc()
+    # close documents opened for this file so memory does not grow over the batch
+    try:
+        for name in list(FreeCAD.listDocuments()):
+            FreeCAD.closeDocument(name)
+    except Exception:
+        pass
+    if ok:
+        print('FreeCAD conversion wrote', outfile)
+    else:
+        failed += 1
+        print('FreeCAD conversion to STL failed for', infile)
+if jobs and failed == len(jobs):
+    raise RuntimeError('FreeCAD conversion to STL failed')
@@ -0,0 +1,64 @@
+"""FreeCAD GUI script used by render_views.py to render the six views straight from STEP files.
+
+Run as `FreeCAD _fc_views_helper.py` with QT_QPA_PLATFORM=offscreen and FC_VIEWS_MANIFEST pointing at
+the JSON manifest (image size, view axes, result file, and per-STEP output paths). FreeCAD treats extra
+command-line arguments as files to open, hence the environment variable.
+"""
+import os
+import sys
+import json
+import traceback
+import FreeCAD
+import FreeCADGui
+import Import
+with open(os.environ['FC_VIEWS_MANIFEST']) as mf:
+    manifest = json.load(mf)
+try:
+    FreeCADGui.showMainWindow()
+except Exception:
+    pass
+width, height = manifest['size']
+done = []
+
+
+def write_result():
+    with open(manifest['result'], 'w') as rf:
+        json.dump(done, rf)
+
+
+for job in manifest['jobs']:
+    doc = None
+    try:
+        doc = FreeCAD.newDocument()
+        Import.insert(job['step'], doc.Name)
+        doc.recompute()
+        view = FreeCADGui.getDocument(doc.Name).activeView()
+        view.setCameraType('Orthographic')
+        for name, outfile in job['views'].items():
+            right, up, back = manifest['axes'][name]
+            # camera orientation maps the camera's x/y/z (right/up/towards viewer) into world space
+            m = FreeCAD.Matrix(right[0], up[0], back[0], 0,
+                               right[1], up[1], back[1], 0,
+                               right[2], up[2], back[2], 0,
+                               0, 0, 0, 1)
+            view.setCameraOrientation(FreeCAD.Rotation(m))
+            view.fitAll()
+            view.saveImage(outfile, width, height, 'White')
+        done.append(job['step'])
+        # record progress per file so a caller that times this run out keeps what is finished
+        write_result()
+        print('FreeCAD rendered views for', job['step'])
+    except Exception:
+        print('FreeCAD view rendering failed for', job['step'])
+        traceback.print_exc()
+    finally:
+        if doc is not None:
+            try:
+                FreeCAD.closeDocument(doc.Name)
+            except Exception:
+                pass
+write_result()
+sys.stdout.flush()
+sys.stderr.flush()
+# leave the GUI event loop right away
+os._exit(0)
@@ -37,6 +37,12 @@ try:
 except Exception:
     MATPLOTLIB_AVAILABLE = False
 
+try:
+    from PIL import Image, ImageDraw
+    PIL_AVAILABLE = True
+except Exception:
+    PIL_AVAILABLE = False
+
 # Try to detect FreeCAD by importing; if fail, allow a configured FreeCAD path
 FREECAD_AVAILABLE = False
 FREECAD_CMD_PATH = r"D:\Apps\FreeCAD\bin\FreeCADCmd.exe"
@@ -91,6 +97,7 @@ def render_mesh_with_matplotlib(mesh, out_path: Path, size=(1024, 1024)):
 
     verts = tri.vertices
     faces = tri.faces
+    import numpy as np
 
     fig = plt.figure(figsize=(size[0] / 100, size[1] / 100), dpi=100)
     ax = fig.add_subplot(111, projection='3d')
@@ -103,19 +110,74 @@ def render_mesh_with_matplotlib(mesh, out_path: Path, size=(1024, 1024)):
         pass
     ax.view_init(elev=0, azim=0)
     ax.axis('off')
-    # auto scale
-    scale = verts.flatten()
-    ax.auto_scale_xyz(scale, scale, scale)
+    # auto scale: equal-sized, per-axis centred limits from one min/max pass keep the aspect ratio
+    lo, hi = verts.min(axis=0), verts.max(axis=0)
+    center, half = (lo + hi) / 2, (hi - lo).max() / 2
+    ax.auto_scale_xyz(*[[c - half, c + half] for c in center])
     plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
-    fig.savefig(str(out_path), dpi=100)
+    if PIL_AVAILABLE:
+        # fast zlib level for previews; libpng's default level 6 dominates encode time
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        Image.fromarray(rgba[:, :, :3]).save(str(out_path), compress_level=1, optimize=False)
+    else:
+        fig.savefig(str(out_path), dpi=100)
     plt.close(fig)
     print('Saved (matplotlib):', out_path)
 
 
+def render_mesh_with_pil(tri, out_path: Path, size=(1024, 1024)):
+    """Rasterize a Trimesh as an orthographic, flat-shaded front view using PIL."""
+    print('Using PIL fallback renderer')
+    import numpy as np
+
+    # front view (matplotlib elev=0, azim=0): screen x = +Y, screen y = +Z, depth = +X
+    verts = np.asarray(tri.vertices, dtype=np.float64)[:, [1, 2, 0]]
+    tris = verts[np.asarray(tri.faces)]
+
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    light = np.array([0.3, 0.4, 1.0])
+    light /= np.linalg.norm(light)
+    intensity = np.abs(np.einsum('ij,j->i', normals, light)) / lengths
+    shade = (60 + 170 * intensity).astype(np.uint8)
+
+    # painter's algorithm: far faces first
+    order = np.argsort(tris[:, :, 2].mean(axis=1))
+
+    lo = verts[:, :2].min(axis=0)
+    hi = verts[:, :2].max(axis=0)
+    scale = 0.9 * min(size) / max(float((hi - lo).max()), 1e-9)
+    xy = (tris[:, :, :2] - (lo + hi) / 2) * scale
+    xy[:, :, 1] *= -1
+    xy += (size[0] / 2, size[1] / 2)
+
+    img = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(img)
+    for coords, g in zip(xy[order].reshape(-1, 6).tolist(), shade[order].tolist()):
+        draw.polygon(coords, fill=(g, g, g))
+    img.save(str(out_path), compress_level=1, optimize=False)
+    print('Saved (PIL):', out_path)
+
+
+def render_mesh_software(tri, out_path: Path):
+    """Render without GL: PIL rasterizer, falling back to matplotlib if PIL is missing or fails."""
+    if PIL_AVAILABLE:
+        try:
+            render_mesh_with_pil(tri, out_path)
+            return
+        except Exception as e:
+            if not MATPLOTLIB_AVAILABLE:
+                raise
+            print('PIL rendering failed, will try matplotlib:', e)
+    render_mesh_with_matplotlib(tri, out_path)
+
+
 def render_with_trimesh(step_path: Path, out_path: Path):
     """Try to load STEP via trimesh (which uses `assimp` if available) and render an orthographic front view."""
     print('Using trimesh backend')
-    mesh = trimesh.load(str(step_path), force='mesh')
+    mesh = trimesh.load(str(step_path), force='mesh', process=False, skip_materials=True)
     if mesh.is_empty:
         raise RuntimeError('trimesh could not load mesh from STEP')
 
@@ -131,8 +193,8 @@ def render_with_trimesh(step_path: Path, out_path: Path):
         out_path.write_bytes(png)
         print('Saved:', out_path)
     except Exception as e:
-        print('trimesh save_image failed, will try matplotlib fallback:', e)
-        if MATPLOTLIB_AVAILABLE:
+        print('trimesh save_image failed, will try PIL/matplotlib fallback:', e)
+        if PIL_AVAILABLE or MATPLOTLIB_AVAILABLE:
             # extract a mesh for matplotlib
             # prefer first geometry
             if isinstance(scene, trimesh.Scene):
@@ -145,16 +207,18 @@ def render_with_trimesh(step_path: Path, out_path: Path):
                 tri = geom
             else:
                 tri = scene
-            render_mesh_with_matplotlib(tri, out_path)
+            render_mesh_software(tri, out_path)
         else:
             raise
 
 
-def render_with_freecad(step_path: Path, out_path: Path, freecad_cmd: str = FREECAD_CMD_PATH):
+def render_with_freecad(step_path: Path, out_path: Path, freecad_cmd: str = FREECAD_CMD_PATH,
+                        deflection: float = None):
     """Use FreeCADCmd to convert STEP to STL/OBJ and render with trimesh.
 
     This writes a temporary Python script that FreeCADCmd executes. FreeCADCmd must be
     the FreeCAD command-line binary (typically in FreeCAD's `bin` folder).
+    `deflection` is the linear tessellation tolerance; None uses bbox diagonal / 1024.
     """
     print('Using FreeCAD -> trimesh backend (FreeCADCmd at %s)' % freecad_cmd)
     if not Path(freecad_cmd).is_file():
@@ -190,6 +254,12 @@ except Exception:
     Import = None
 infile = sys.argv[-2]
 outfile = sys.argv[-1]
+deflection = {deflection!r}
+# binary STL: several times smaller than ASCII and parsed straight into arrays by trimesh
+try:
+    FreeCAD.ParamGet('User parameter:BaseApp/Preferences/Mod/Mesh').SetBool('AsciiSTL', False)
+except Exception:
+    pass
 print('FreeCAD script start. argv=', sys.argv)
 print('FreeCAD script start. infile=', infile, 'outfile=', outfile)
 ok = False
@@ -214,14 +284,16 @@ if not ok and Part is not None and MeshPart is not None:
         print('Trying Part.read + MeshPart.meshFromShape')
         shape = Part.read(infile)
         print('Part.read ok, creating mesh')
-        mesh = MeshPart.meshFromShape(shape, 0.1)
+        if deflection is None:
+            deflection = shape.BoundBox.DiagonalLength / 1024.0
+        mesh = MeshPart.meshFromShape(Shape=shape, LinearDeflection=deflection, AngularDeflection=0.5)
         print('mesh created, type=', type(mesh))
         try:
-            Mesh.export([mesh], outfile)
-            print('Mesh.export succeeded from meshFromShape')
+            mesh.write(outfile, 'STL')
+            print('mesh.write succeeded from meshFromShape')
             ok = True
         except Exception as e:
-            print('Mesh.export failed on meshFromShape:', e)
+            print('mesh.write failed on meshFromShape:', e)
     except Exception as e:
         print('Part.read/MeshPart failed:', e)
 
@@ -272,7 +344,7 @@ print('FreeCAD script finished')
         if not TRIMESH_AVAILABLE:
             raise RuntimeError('trimesh required to render converted mesh')
 
-        mesh = trimesh.load(str(out_mesh), force='mesh')
+        mesh = trimesh.load(str(out_mesh), file_type='stl', force='mesh', process=False, skip_materials=True)
         if isinstance(mesh, trimesh.Scene):
             scene = mesh
         else:
@@ -284,8 +356,8 @@ print('FreeCAD script finished')
             out_path.write_bytes(png)
             print('Saved:', out_path)
         except Exception as e:
-            print('trimesh save_image failed for converted mesh, will try matplotlib fallback:', e)
-            if MATPLOTLIB_AVAILABLE:
+            print('trimesh save_image failed for converted mesh, will try PIL/matplotlib fallback:', e)
+            if PIL_AVAILABLE or MATPLOTLIB_AVAILABLE:
                 # pick first geometry
                 if isinstance(scene, trimesh.Scene):
                     geom = None
@@ -297,7 +369,7 @@ print('FreeCAD script finished')
                     tri = geom
                 else:
                     tri = scene
-                render_mesh_with_matplotlib(tri, out_path)
+                render_mesh_software(tri, out_path)
             else:
                 raise RuntimeError('Failed to render converted mesh: %s' % e)
 
@@ -318,12 +390,14 @@ def main():
     parser.add_argument('step', type=Path)
     parser.add_argument('--out', type=Path, default=Path('front_view.png'))
     parser.add_argument('--freecad-cmd', type=str, default=FREECAD_CMD_PATH, help='Path to FreeCADCmd.exe')
+    parser.add_argument('--deflection', type=float, default=None,
+                        help='Linear tessellation deflection for STEP->STL (default: bbox diagonal / 1024)')
     args = parser.parse_args()
 
     # try FreeCAD conversion first (if available or if user provided path exists)
     if Path(args.freecad_cmd).is_file():
         try:
-            render_with_freecad(args.step, args.out, freecad_cmd=args.freecad_cmd)
+            render_with_freecad(args.step, args.out, freecad_cmd=args.freecad_cmd, deflection=args.deflection)
             return
         except Exception as e:
             print('FreeCAD backend failed:', e)
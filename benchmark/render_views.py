@@ -1,20 +1,53 @@
 """Render six orthographic views (front, back, left, right, top, bottom) from a STEP file.
 
-This script uses FreeCADCmd to convert STEP->STL, then loads the STL via trimesh (if installed) or
-uses matplotlib to render the mesh in the requested camera orientations.
+This script uses FreeCADCmd to convert STEP->STL, then loads the STL via trimesh (if installed) and
+renders it with trimesh, or with a PIL rasterizer / matplotlib as fallback, in the requested camera
+orientations. If a FreeCAD GUI binary is given (--freecad-gui), the views are first rendered directly
+in FreeCAD with an offscreen Qt platform, skipping the STL round trip.
 
 Outputs are saved as <sample>_front.png, <sample>_back.png, etc. in the same folder as the STEP.
 """
 from pathlib import Path
 import subprocess
 import tempfile
+import shutil
 import argparse
 import os
-import glob
+import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from types import SimpleNamespace
 
 # We reuse parts of render_front.py logic but keep this script self-contained for clarity
 FREECAD_CMD_DEFAULT = r"D:\Apps\FreeCAD\bin\FreeCADCmd.exe"
 
+VIEWS = ['front', 'back', 'left', 'right', 'top', 'bottom']
+
+# Meshes above this many faces are decimated before rendering; a 1024x1024 preview cannot
+# resolve more, and the software renderers' cost grows linearly with face count.
+MAX_FACES = 200_000
+
+# Below this many faces the six software views render serially faster than worker processes start
+# (the PIL rasterizer takes roughly 2.5 us per face and view).
+VIEW_POOL_MIN_FACES = 100_000
+
+# The FreeCAD GUI can hang for good (a modal startup dialog offscreen, or the helper failing
+# before it exits), so its run is killed after this many seconds plus so many per STEP file.
+FREECAD_GUI_TIMEOUT = 120
+FREECAD_GUI_TIMEOUT_PER_FILE = 60
+
+# World-space screen axes of each view as (right, up, towards camera) rows,
+# matching the elev/azim presets of the matplotlib renderer.
+VIEW_AXES = {
+    'front': ((0, 1, 0), (0, 0, 1), (1, 0, 0)),
+    'back': ((0, -1, 0), (0, 0, 1), (-1, 0, 0)),
+    'left': ((-1, 0, 0), (0, 0, 1), (0, 1, 0)),
+    'right': ((1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    'top': ((0, 1, 0), (-1, 0, 0), (0, 0, 1)),
+    'bottom': ((0, 1, 0), (1, 0, 0), (0, 0, -1)),
+}
+
 try:
     import trimesh
     TRIMESH_AVAILABLE = True
@@ -25,145 +58,355 @@ try:
     import matplotlib
     matplotlib.use('Agg')
     import matplotlib.pyplot as plt
-    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
+    from matplotlib.collections import PolyCollection
     MATPLOTLIB_AVAILABLE = True
 except Exception:
     MATPLOTLIB_AVAILABLE = False
 
+try:
+    from PIL import Image, ImageDraw
+    PIL_AVAILABLE = True
+except Exception:
+    PIL_AVAILABLE = False
 
-def convert_step_to_stl(step_path: Path, freecad_cmd: str = FREECAD_CMD_DEFAULT) -> Path:
-    """Use FreeCADCmd to convert STEP to STL, return path to STL.
 
-    Raises RuntimeError on failure.
+# FreeCAD-side scripts. They live next to this file and take all inputs from a JSON manifest,
+# so nothing is templated or written out per run.
+FC_EXPORT_HELPER = Path(__file__).resolve().with_name('_fc_export_helper.py')
+FC_VIEWS_HELPER = Path(__file__).resolve().with_name('_fc_views_helper.py')
+
+
+def _start_stl_conversion(step_paths, freecad_cmd: str, deflection: float, workdir: Path, verbose: bool = False):
+    """Launch FreeCADCmd on a manifest of `step_paths` without waiting for it.
+
+    Returns (proc, jobs, manifest, deflection) to be passed to _finish_stl_conversion. FreeCAD's stderr (and its
+    stdout when `verbose`) goes to log files next to the manifest so a pipe can never fill up while
+    the caller does other work; stdout is discarded otherwise.
     """
-    if not Path(freecad_cmd).is_file():
-        raise RuntimeError(f'FreeCADCmd not found at {freecad_cmd}')
+    fd, manifest = tempfile.mkstemp(suffix='.json', prefix='fc_manifest_', dir=workdir)
+    os.close(fd)
+    manifest = Path(manifest)
+    jobs = [(Path(p), workdir / f'{manifest.stem}_{i}.stl') for i, p in enumerate(step_paths)]
+    manifest.write_text(json.dumps({
+        'deflection': deflection,
+        'jobs': [[str(s), str(o)] for s, o in jobs],
+    }))
+    with open(manifest.with_suffix('.err'), 'wb') as err:
+        if verbose:
+            with open(manifest.with_suffix('.out'), 'wb') as out:
+                proc = subprocess.Popen([freecad_cmd, str(FC_EXPORT_HELPER), str(manifest)], stdout=out, stderr=err)
+        else:
+            proc = subprocess.Popen([freecad_cmd, str(FC_EXPORT_HELPER), str(manifest)], stdout=subprocess.DEVNULL,
+                                    stderr=err)
+    return proc, jobs, manifest, deflection
 
-    with tempfile.TemporaryDirectory() as td:
-        td_path = Path(td)
-        out_mesh = td_path / 'out.stl'
-        fc_script = td_path / 'fc_export.py'
-        fc_code = f"""
-import sys
-import traceback
-try:
-    import FreeCAD
-except Exception:
-    FreeCAD = None
-try:
-    import Part
-except Exception:
-    Part = None
-try:
-    import Mesh
-except Exception:
-    Mesh = None
-try:
-    import MeshPart
-except Exception:
-    MeshPart = None
-try:
-    import Import
-except Exception:
-    Import = None
-infile = sys.argv[-2]
-outfile = sys.argv[-1]
-print('fc script argv=', sys.argv)
-# try Import.open -> Mesh.export
-ok = False
-if Import is not None:
-    try:
-        objs = Import.open(infile)
-        try:
-            Mesh.export(objs, outfile)
-            ok = True
-        except Exception:
-            pass
-    except Exception:
-        pass
-# try Import into doc
-if not ok:
-    try:
-        try:
-            doc = FreeCAD.newDocument()
-        except Exception:
-            import App
-            doc = App.newDocument()
-        Import.open(infile, doc.Name)
-        objs = doc.Objects
-        Mesh.export(objs, outfile)
-        ok = True
-    except Exception:
-        pass
-if not ok:
-    raise RuntimeError('FreeCAD conversion to STL failed')
-print('FreeCAD conversion wrote', outfile)
-"""
-        fc_script.write_text(fc_code)
-        proc = subprocess.run([freecad_cmd, str(fc_script), str(step_path), str(out_mesh)], capture_output=True)
-        stdout = proc.stdout.decode('utf-8', errors='ignore') if proc.stdout else ''
-        stderr = proc.stderr.decode('utf-8', errors='ignore') if proc.stderr else ''
+
+def _finish_stl_conversion(proc, jobs, manifest: Path, deflection: float, verbose: bool = False) -> dict:
+    """Wait for a FreeCAD run started by _start_stl_conversion and move its STLs next to the STEPs.
+
+    The deflection used is recorded next to each STL so a later run with another one reconverts.
+    """
+    proc.wait()
+    # FreeCAD's console output is only worth the (slow, synchronous) console writes when asked
+    # for or when something went wrong
+    if verbose:
+        stdout = manifest.with_suffix('.out').read_text(encoding='utf-8', errors='ignore')
         if stdout:
             print('FreeCAD stdout:', stdout)
+    if verbose or proc.returncode != 0 or not all(out_mesh.exists() for _, out_mesh in jobs):
+        stderr = manifest.with_suffix('.err').read_text(encoding='utf-8', errors='ignore')
         if stderr:
             print('FreeCAD stderr:', stderr)
+    converted = {}
+    for step_p, out_mesh in jobs:
         if not out_mesh.exists():
-            raise RuntimeError('FreeCAD did not produce STL; stderr: ' + stderr)
+            print('FreeCAD did not produce STL for', step_p)
+            continue
         # copy to a persistent location (next to step)
-        dest = step_path.parent / (step_path.stem + '.stl')
-        with open(out_mesh, 'rb') as rf, open(dest, 'wb') as wf:
-            wf.write(rf.read())
+        dest = step_p.parent / (step_p.stem + '.stl')
+        try:
+            shutil.copyfile(out_mesh, dest)
+            out_mesh.unlink()
+            _mesh_info_path(dest).write_text(json.dumps({'deflection': deflection}))
+        except OSError as e:
+            print('Failed to copy mesh for', step_p, ':', e)
+            continue
         print('Wrote mesh to', dest)
+        converted[step_p] = dest
+    for suffix in ('.json', '.out', '.err'):
+        if manifest.with_suffix(suffix).exists():
+            manifest.with_suffix(suffix).unlink()
+    return converted
+
+
+def convert_steps_to_stl(step_paths, freecad_cmd: str = FREECAD_CMD_DEFAULT, deflection: float = None,
+                         workdir: Path = None, verbose: bool = False) -> dict:
+    """Convert several STEP files to STL with a single FreeCADCmd run.
+
+    The (infile, outfile) pairs are written to a JSON manifest that the FreeCAD script loops over,
+    so FreeCAD's startup cost is paid once per batch instead of once per file.
+    `deflection` is the linear tessellation tolerance; None picks bbox diagonal / 1024
+    per part, about one pixel of chord error in a 1024px preview.
+    `workdir` is a scratch directory for manifests and temporary meshes, shareable across calls;
+    a temporary one is created when omitted. FreeCAD's output is printed only with `verbose` or on failure.
+    Returns a dict mapping each converted STEP path to its STL; files FreeCAD failed on are left out.
+    Raises RuntimeError if FreeCADCmd is missing.
+    """
+    if not Path(freecad_cmd).is_file():
+        raise RuntimeError(f'FreeCADCmd not found at {freecad_cmd}')
+    if workdir is None:
+        with tempfile.TemporaryDirectory() as td:
+            return convert_steps_to_stl(step_paths, freecad_cmd=freecad_cmd, deflection=deflection, workdir=Path(td),
+                                        verbose=verbose)
+    started = _start_stl_conversion(step_paths, freecad_cmd, deflection, Path(workdir), verbose=verbose)
+    return _finish_stl_conversion(*started, verbose=verbose)
+
+
+def render_views_with_freecad(step_paths, freecad_gui: str, size=(1024, 1024), verbose: bool = False) -> list:
+    """Render the six views of each STEP in FreeCAD's GUI (offscreen Qt), skipping STEP->STL->trimesh.
+
+    `freecad_gui` is the GUI binary (FreeCAD.exe), not FreeCADCmd. All files go through one FreeCAD run.
+    Returns the STEP paths for which every view was written, also when the run is killed after its
+    timeout. Raises RuntimeError if the binary is missing.
+    """
+    if not Path(freecad_gui).is_file():
+        raise RuntimeError(f'FreeCAD not found at {freecad_gui}')
+
+    with tempfile.TemporaryDirectory() as td:
+        td_path = Path(td)
+        manifest = td_path / 'fc_views.json'
+        result = td_path / 'fc_views_done.json'
+        manifest.write_text(json.dumps({
+            'size': list(size),
+            'axes': VIEW_AXES,
+            'result': str(result),
+            'jobs': [{'step': str(p), 'views': {v: str(Path(p).parent / (Path(p).stem + '_' + v + '.png'))
+                                                for v in VIEWS}} for p in step_paths],
+        }))
+        env = dict(os.environ, QT_QPA_PLATFORM='offscreen', FC_VIEWS_MANIFEST=str(manifest))
+        timeout = FREECAD_GUI_TIMEOUT + FREECAD_GUI_TIMEOUT_PER_FILE * len(step_paths)
+        try:
+            proc = subprocess.run([freecad_gui, str(FC_VIEWS_HELPER)], stdout=None if verbose else subprocess.DEVNULL,
+                                  stderr=subprocess.PIPE, env=env, timeout=timeout)
+            returncode, stderr = proc.returncode, proc.stderr
+        except subprocess.TimeoutExpired as e:
+            # run() has already killed FreeCAD; files it did not finish take the STL route
+            print('FreeCAD view rendering timed out after', timeout, 's')
+            returncode, stderr = None, e.stderr
+        try:
+            done = set(json.loads(result.read_text())) if result.exists() else set()
+        except ValueError:
+            done = set()
+        if verbose or returncode != 0 or len(done) < len(step_paths):
+            stderr = stderr.decode('utf-8', errors='ignore') if stderr else ''
+            if stderr:
+                print('FreeCAD stderr:', stderr)
+        if not result.exists():
+            print('FreeCAD view rendering did not finish')
+    return [p for p in step_paths if str(p) in done]
+
+
+def _mesh_info_path(stl_path: Path) -> Path:
+    """Sidecar recording how `stl_path` was tessellated: <sample>.stl.json."""
+    return stl_path.with_name(stl_path.name + '.json')
+
+
+def _stl_is_fresh(step_path: Path, deflection: float = None) -> bool:
+    """True if the STL next to `step_path` is not older than the STEP and was made with `deflection`.
+
+    STLs without a recorded deflection (written before it was tracked) count as made with the default.
+    """
+    dest = step_path.parent / (step_path.stem + '.stl')
+    if not dest.exists() or dest.stat().st_mtime < step_path.stat().st_mtime:
+        return False
+    info = _mesh_info_path(dest)
+    try:
+        recorded = json.loads(info.read_text()).get('deflection') if info.exists() else None
+    except (OSError, ValueError, AttributeError):
+        return False
+    return recorded == deflection
+
+
+def convert_step_to_stl(step_path: Path, freecad_cmd: str = FREECAD_CMD_DEFAULT, overwrite: bool = False,
+                        deflection: float = None, verbose: bool = False) -> Path:
+    """Use FreeCADCmd to convert STEP to STL, return path to STL.
+
+    An up-to-date STL from a previous run with the same `deflection` is reused unless `overwrite` is set.
+    Raises RuntimeError on failure.
+    """
+    step_path = Path(step_path)
+    dest = step_path.parent / (step_path.stem + '.stl')
+    if not overwrite and _stl_is_fresh(step_path, deflection):
+        print('Reusing cached mesh', dest)
         return dest
+    converted = convert_steps_to_stl([step_path], freecad_cmd=freecad_cmd, deflection=deflection, verbose=verbose)
+    if step_path not in converted:
+        raise RuntimeError(f'FreeCAD did not produce STL for {step_path}')
+    return converted[step_path]
+
+
+def _project_view(tri, view: str):
+    """Project `tri` into an axis-aligned view.
+
+    Returns (verts, tris, intensity, order): view-space vertices (x right, y up, z towards the
+    camera), per-face view-space triangles, a flat-shading intensity in [0, 1] per face, and
+    the face indices sorted far to near for painter's-algorithm drawing.
+    """
+    import numpy as np
+
+    rot = np.array(VIEW_AXES[view], dtype=np.float64)
+    verts = np.asarray(tri.vertices, dtype=np.float64) @ rot.T
+    tris = verts[np.asarray(tri.faces)]
+
+    # flat shading against a light slightly above-right of the camera; STL winding
+    # is not reliable, so both sides of a face are lit the same
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    lengths[lengths == 0] = 1.0
+    light = np.array([0.3, 0.4, 1.0])
+    light /= np.linalg.norm(light)
+    intensity = np.abs(np.einsum('ij,j->i', normals, light)) / lengths
+
+    order = np.argsort(tris[:, :, 2].mean(axis=1))
+    return verts, tris, intensity, order
 
 
 def render_with_matplotlib_mesh(tri, out_path: Path, view: str, size=(1024, 1024)):
-    """Render a trimesh.Trimesh with matplotlib according to view name."""
-    verts = tri.vertices
-    faces = tri.faces
+    """Render a trimesh.Trimesh with matplotlib according to view name.
+
+    Views are axis-aligned, so the depth order is just the view axis: faces are projected and sorted
+    in NumPy and drawn as a 2D PolyCollection instead of through Axes3D's per-face Python depth sort.
+    """
     import numpy as np
 
     fig = plt.figure(figsize=(size[0] / 100, size[1] / 100), dpi=100)
-    ax = fig.add_subplot(111, projection='3d')
-    ax.plot_trisurf(verts[:, 0], verts[:, 1], faces, verts[:, 2], color=(0.8, 0.8, 0.8), linewidth=0.0)
-
-    # choose view
-    if view == 'front':
-        elev, azim = 0, 0
-    elif view == 'back':
-        elev, azim = 0, 180
-    elif view == 'left':
-        elev, azim = 0, 90
-    elif view == 'right':
-        elev, azim = 0, -90
-    elif view == 'top':
-        elev, azim = 90, 0
-    elif view == 'bottom':
-        elev, azim = -90, 0
-    else:
-        elev, azim = 0, 0
-
-    try:
-        ax.set_proj_type('ortho')
-    except Exception:
-        pass
-    ax.view_init(elev=elev, azim=azim)
+    proj, tris, intensity, order = _project_view(tri, view)
+    gray = (60 + 170 * intensity[order]) / 255.0
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.add_collection(PolyCollection(tris[order, :, :2], facecolors=np.repeat(gray[:, None], 3, axis=1),
+                                     edgecolors='none', linewidths=0, antialiased=False))
+    # same 5% margin as the PIL rasterizer
+    lo, hi = proj[:, :2].min(axis=0), proj[:, :2].max(axis=0)
+    center, half = (lo + hi) / 2, (hi - lo).max() / 2 / 0.9
+    ax.set_xlim(center[0] - half, center[0] + half)
+    ax.set_ylim(center[1] - half, center[1] + half)
+    ax.set_aspect('equal')
     ax.axis('off')
-    scale = verts.flatten()
-    ax.auto_scale_xyz(scale, scale, scale)
-    plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
-    fig.savefig(str(out_path), dpi=100)
+    if PIL_AVAILABLE:
+        # fast zlib level for previews; libpng's default level 6 dominates encode time
+        fig.canvas.draw()
+        rgba = np.asarray(fig.canvas.buffer_rgba())
+        Image.fromarray(rgba[:, :, :3]).save(str(out_path), compress_level=1, optimize=False)
+    else:
+        fig.savefig(str(out_path), dpi=100)
     plt.close(fig)
     print('Saved', out_path)
 
 
-def render_all_views(step_path: Path, freecad_cmd: str = FREECAD_CMD_DEFAULT):
-    # convert
-    stl_path = convert_step_to_stl(step_path, freecad_cmd=freecad_cmd)
+def render_with_pil_mesh(tri, out_path: Path, view: str, size=(1024, 1024)):
+    """Rasterize a trimesh.Trimesh orthographically with PIL, flat shaded, according to view name."""
+    verts, tris, intensity, order = _project_view(tri, view)
+    shade = (60 + 170 * intensity).astype('uint8')
+
+    # fit the projection into the image with a 5% margin, y pointing up
+    lo = verts[:, :2].min(axis=0)
+    hi = verts[:, :2].max(axis=0)
+    scale = 0.9 * min(size) / max(float((hi - lo).max()), 1e-9)
+    xy = (tris[:, :, :2] - (lo + hi) / 2) * scale
+    xy[:, :, 1] *= -1
+    xy += (size[0] / 2, size[1] / 2)
+
+    # painter's algorithm: far faces first
+    img = Image.new('RGB', size, 'white')
+    draw = ImageDraw.Draw(img)
+    for coords, g in zip(xy[order].reshape(-1, 6).tolist(), shade[order].tolist()):
+        draw.polygon(coords, fill=(g, g, g))
+    img.save(str(out_path), compress_level=1, optimize=False)
+    print('Saved', out_path)
+
+
+def view_camera_transform(tri, view: str, fov):
+    """Camera pose looking at `tri` from the given view, framed so the whole mesh is visible."""
+    import numpy as np
+
+    rotation = np.eye(4)
+    rotation[:3, :3] = np.array(VIEW_AXES[view], dtype=np.float64).T
+    corners = trimesh.bounds.corners(tri.bounds)
+    return trimesh.scene.cameras.look_at(corners, fov, rotation=rotation)
+
+
+def _render_software_view(tri, out: Path, view: str):
+    """Render one view without GL: PIL rasterizer, then matplotlib, then the sample's screenshot."""
+    if PIL_AVAILABLE:
+        try:
+            render_with_pil_mesh(tri, out, view)
+            return
+        except Exception as e:
+            print('PIL rendering failed for view', view, ', trying matplotlib:', e)
+    try:
+        if MATPLOTLIB_AVAILABLE:
+            render_with_matplotlib_mesh(tri, out, view)
+        else:
+            # final fallback: copy existing screenshot
+            ss = out.parent / 'screenshot.png'
+            if ss.exists():
+                shutil.copy2(ss, out)
+                print('Copied existing screenshot to', out)
+            else:
+                raise RuntimeError('No renderer available and no screenshot to copy')
+    except Exception as e:
+        print('Failed to render view', view, ':', e)
+
+
+def _to_shared(arr) -> shared_memory.SharedMemory:
+    """Copy a NumPy array into a new shared memory block."""
+    import numpy as np
+
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm
+
+
+def _render_view_worker(verts_spec, faces_spec, out_path_str: str, view: str):
+    """Render one view in a worker process from vertex/face arrays held in shared memory.
+
+    Each spec is (shared memory name, shape, dtype str), as set up by render_all_views.
+    """
+    import numpy as np
+
+    blocks = [shared_memory.SharedMemory(name=spec[0]) for spec in (verts_spec, faces_spec)]
+    try:
+        verts, faces = [np.ndarray(spec[1], dtype=spec[2], buffer=shm.buf)
+                        for spec, shm in zip((verts_spec, faces_spec), blocks)]
+        _render_software_view(SimpleNamespace(vertices=verts, faces=faces), Path(out_path_str), view)
+        # views into the blocks must be gone before they can be closed
+        del verts, faces
+    finally:
+        for shm in blocks:
+            shm.close()
+
+
+def render_all_views(step_path: Path, freecad_cmd: str = FREECAD_CMD_DEFAULT, stl_path: Path = None,
+                     overwrite: bool = False, deflection: float = None, view_workers: int = 1,
+                     freecad_gui: str = None, verbose: bool = False):
+    # with a FreeCAD GUI binary, try rendering the views in FreeCAD itself first
+    if freecad_gui and stl_path is None:
+        try:
+            if render_views_with_freecad([step_path], freecad_gui, verbose=verbose):
+                return
+        except Exception as e:
+            print('FreeCAD view rendering failed, falling back to STL rendering:', e)
+
+    # convert, unless the caller already did; `overwrite` forces a fresh conversion over a cached STL
+    if stl_path is None:
+        stl_path = convert_step_to_stl(step_path, freecad_cmd=freecad_cmd, overwrite=overwrite, deflection=deflection,
+                                       verbose=verbose)
 
     # load via trimesh if available
     if TRIMESH_AVAILABLE:
-        scene_or_mesh = trimesh.load(str(stl_path), force='mesh')
+        # display only: skip trimesh's vertex merging/cleanup pass
+        scene_or_mesh = trimesh.load(str(stl_path), file_type='stl', force='mesh', process=False,
+                                     skip_materials=True)
         if isinstance(scene_or_mesh, trimesh.Scene):
             # take first geometry
             tri = None
@@ -178,54 +421,173 @@ def render_all_views(step_path: Path, freecad_cmd: str = FREECAD_CMD_DEFAULT):
         # if trimesh not available, try to load stl minimally with numpy-stl? here we assume matplotlib can still render
         raise RuntimeError('trimesh required for mesh processing; please install trimesh or run render_front fallback')
 
-    views = ['front', 'back', 'left', 'right', 'top', 'bottom']
-    for v in views:
-        out = step_path.parent / (step_path.stem + '_' + v + '.png')
+    if len(tri.faces) > MAX_FACES:
         try:
-            # try trimesh rendering first
+            # the mesh was loaded unprocessed (a triangle soup), so weld vertices before decimating
+            tri.merge_vertices()
+            decimated = tri.simplify_quadric_decimation(face_count=MAX_FACES)
+            print('Decimated mesh from', len(tri.faces), 'to', len(decimated.faces), 'faces')
+            tri = decimated
+        except Exception as e:
+            print('Mesh decimation unavailable, rendering all', len(tri.faces), 'faces:', e)
+
+    # one scene for all views; only the camera moves between renders
+    scene = trimesh.Scene(tri)
+    # probe the offscreen renderer once so a missing GL/pyglet fails once, not six times
+    try:
+        scene.save_image(resolution=(16, 16), visible=True)
+        use_trimesh_render = True
+    except Exception as e:
+        print('trimesh save_image unavailable, using software rendering:', e)
+        use_trimesh_render = False
+    software_views = []
+    for v in VIEWS:
+        out = step_path.parent / (step_path.stem + '_' + v + '.png')
+        # try trimesh rendering first
+        if use_trimesh_render:
             try:
-                scene = trimesh.Scene(tri)
+                scene.camera_transform = view_camera_transform(tri, v, scene.camera.fov)
                 png = scene.save_image(resolution=(1024, 1024), visible=True)
                 out.write_bytes(png)
                 print('Saved via trimesh:', out)
                 continue
             except Exception as e:
-                print('trimesh save_image failed, falling back to matplotlib:', e)
-            # matplotlib fallback
-            if MATPLOTLIB_AVAILABLE:
-                render_with_matplotlib_mesh(tri, out, v)
-            else:
-                # final fallback: copy existing screenshot
-                ss = step_path.parent / 'screenshot.png'
-                if ss.exists():
-                    import shutil
-                    shutil.copy2(ss, out)
-                    print('Copied existing screenshot to', out)
-                else:
-                    raise RuntimeError('No renderer available and no screenshot to copy')
-        except Exception as e:
-            print('Failed to render view', v, ':', e)
+                print('trimesh save_image failed, falling back to software rendering:', e)
+        software_views.append((v, out))
+
+    view_workers = min(view_workers, os.cpu_count() or 1, len(software_views))
+    if view_workers > 1 and len(tri.faces) >= VIEW_POOL_MIN_FACES:
+        # software views are CPU bound and independent: render them in parallel, with the mesh
+        # placed in shared memory once so workers map it instead of unpickling a copy each
+        import numpy as np
+
+        arrays = [np.ascontiguousarray(tri.vertices), np.ascontiguousarray(tri.faces)]
+        blocks = [_to_shared(arr) for arr in arrays]
+        try:
+            specs = [(shm.name, arr.shape, arr.dtype.str) for shm, arr in zip(blocks, arrays)]
+            with ProcessPoolExecutor(max_workers=view_workers) as executor:
+                futures = [executor.submit(_render_view_worker, specs[0], specs[1], str(out), v)
+                           for v, out in software_views]
+                for fut in futures:
+                    fut.result()
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+    else:
+        for v, out in software_views:
+            _render_software_view(tri, out, v)
+
+
+def _outputs_exist(step_p: Path, existing=None) -> bool:
+    """True if all view PNGs of `step_p` exist; `existing` is the parent's file names if already listed."""
+    if existing is None:
+        existing = os.listdir(step_p.parent)
+    needed = {step_p.stem + '_' + v + '.png' for v in VIEWS}
+    return needed <= set(existing)
+
+
+def _render_one(step_path_str: str, freecad_cmd: str, overwrite: bool = False, deflection: float = None,
+                verbose: bool = False, stl_path_str: str = None):
+    """Render the six views of one STEP file. Module-level so it can be pickled into worker processes.
+
+    `stl_path_str` is the mesh the batch already converted or found cached; without it the STEP is converted here.
+    """
+    step_p = Path(step_path_str)
+    # determine outputs exist?
+    if not overwrite and _outputs_exist(step_p):
+        print('Skipping (exists):', step_p)
+        return
+    stl_path = Path(stl_path_str) if stl_path_str else None
+    try:
+        render_all_views(step_p, freecad_cmd=freecad_cmd, stl_path=stl_path, deflection=deflection, verbose=verbose)
+    except Exception as e:
+        print('Error rendering', step_p, ':', e)
 
 
-def batch_render(batch_root: Path, freecad_cmd: str, overwrite: bool = False):
-    # find all cad.step files under batch_root
-    pattern = str(Path(batch_root) / '**' / 'cad.step')
-    files = glob.glob(pattern, recursive=True)
+def batch_render(batch_root: Path, freecad_cmd: str, overwrite: bool = False, workers: int = None,
+                 deflection: float = None, chunk_size: int = 16, freecad_gui: str = None, verbose: bool = False):
+    if chunk_size < 1:
+        raise ValueError(f'chunk_size must be at least 1, got {chunk_size}')
+    if workers is not None and workers < 1:
+        raise ValueError(f'workers must be at least 1, got {workers}')
+    # find all cad.step files under batch_root (a plain walk with a name check is cheaper than a ** glob);
+    # keep each directory's listing so the skip check below needs no further syscalls
+    listings = {r: fs for r, _, fs in os.walk(batch_root) if 'cad.step' in fs}
+    files = [os.path.join(r, 'cad.step') for r in listings]
     if not files:
         print('No cad.step files found under', batch_root)
         return
     print('Found', len(files), 'STEP files')
+    pending = []
     for f in sorted(files):
         step_p = Path(f)
-        # determine outputs exist?
-        outputs = [step_p.parent / (step_p.stem + '_' + v + '.png') for v in ['front','back','left','right','top','bottom']]
-        if not overwrite and all(o.exists() for o in outputs):
+        if not overwrite and _outputs_exist(step_p, listings[os.path.dirname(f)]):
             print('Skipping (exists):', step_p)
             continue
+        pending.append(step_p)
+    if freecad_gui:
+        # render what FreeCAD can directly in one GUI run; the rest takes the STL route
         try:
-            render_all_views(step_p, freecad_cmd=freecad_cmd)
+            done = render_views_with_freecad(pending, freecad_gui, verbose=verbose)
         except Exception as e:
-            print('Error rendering', step_p, ':', e)
+            print('FreeCAD view rendering failed, falling back to STL rendering:', e)
+            done = []
+        pending = [p for p in pending if p not in done]
+    if not pending:
+        return
+    to_convert = [p for p in pending if overwrite or not _stl_is_fresh(p, deflection)]
+    if to_convert and not Path(freecad_cmd).is_file():
+        # files with a cached STL can still be rendered; only the ones needing conversion are lost
+        for step_p in to_convert:
+            print('Error rendering', step_p, ':', f'FreeCADCmd not found at {freecad_cmd}')
+        pending = [p for p in pending if p not in to_convert]
+        to_convert = []
+        if not pending:
+            return
+
+    # files are independent, so render them in parallel; keep half the cores free for
+    # the threads FreeCAD/OCCT and the GL/matplotlib backends spawn themselves
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 2) // 2)
+    with tempfile.TemporaryDirectory() as td, ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit(meshes):
+            # hand each worker its STL explicitly rather than have it re-check the cache
+            return [executor.submit(_render_one, str(p), freecad_cmd, overwrite, deflection, verbose, str(stl))
+                    for p, stl in meshes.items()]
+
+        def collect(chunk, started):
+            # a failed chunk only loses its own files, never the rest of the batch
+            try:
+                converted = _finish_stl_conversion(*started, verbose=verbose) if started else {}
+            except Exception as e:
+                print('STL conversion failed:', e)
+                converted = {}
+            for step_p in chunk:
+                if step_p not in converted:
+                    print('Error rendering', step_p, ': STL conversion failed')
+            return submit(converted)
+
+        # files with an up-to-date STL render while FreeCAD converts the rest
+        futures = submit({p: p.parent / (p.stem + '.stl') for p in pending if p not in to_convert})
+        # one FreeCAD run per chunk, two runs in flight: chunk N+1 converts while chunk N is
+        # being rendered, hiding FreeCAD's startup behind rendering. All runs share one
+        # scratch dir and one copy of the FreeCAD script.
+        in_flight = deque()
+        for i in range(0, len(to_convert), chunk_size):
+            chunk = to_convert[i:i + chunk_size]
+            try:
+                started = _start_stl_conversion(chunk, freecad_cmd, deflection, Path(td), verbose=verbose)
+            except Exception as e:
+                print('Failed to start FreeCADCmd:', e)
+                started = None
+            in_flight.append((chunk, started))
+            if len(in_flight) == 2:
+                futures += collect(*in_flight.popleft())
+        while in_flight:
+            futures += collect(*in_flight.popleft())
+        for fut in futures:
+            fut.result()
 
 
 if __name__ == '__main__':
@@ -234,12 +596,34 @@ if __name__ == '__main__':
     parser.add_argument('--freecad-cmd', type=str, default=FREECAD_CMD_DEFAULT)
     parser.add_argument('--batch', action='store_true', help='Enable batch mode to process many samples')
     parser.add_argument('--batch-root', type=Path, default=Path('benchmark/resources'))
-    parser.add_argument('--overwrite', action='store_true', help='Overwrite existing outputs')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Overwrite existing outputs, including cached STL meshes')
+    parser.add_argument('--deflection', type=float, default=None,
+                        help='Linear tessellation deflection for STEP->STL (default: bbox diagonal / 1024)')
+    parser.add_argument('--chunk-size', type=int, default=16,
+                        help='STEP files per FreeCADCmd run in batch mode; two runs overlap with rendering')
+    parser.add_argument('--view-workers', type=int, default=len(VIEWS),
+                        help='Worker processes for the six views of a single STEP when software rendering, capped '
+                             'at the CPU count; used only for meshes of at least %d faces (batch mode renders '
+                             'views serially and parallelises over files instead)' % VIEW_POOL_MIN_FACES)
+    parser.add_argument('--freecad-gui', type=str, default=None,
+                        help='Path to the FreeCAD GUI binary (FreeCAD.exe); if given, views are first rendered '
+                             'directly in FreeCAD offscreen, falling back to the STL pipeline')
+    parser.add_argument('--verbose', action='store_true', help='Print FreeCAD output even when conversion succeeds')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes for batch mode (default: half the CPU cores)')
     args = parser.parse_args()
 
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+    if args.workers is not None and args.workers < 1:
+        parser.error('--workers must be at least 1')
     if args.batch:
-        batch_render(args.batch_root, freecad_cmd=args.freecad_cmd, overwrite=args.overwrite)
+        batch_render(args.batch_root, freecad_cmd=args.freecad_cmd, overwrite=args.overwrite, workers=args.workers,
+                     deflection=args.deflection, chunk_size=args.chunk_size, freecad_gui=args.freecad_gui,
+                     verbose=args.verbose)
     else:
         if not args.step:
             parser.error('Please provide a STEP file or use --batch')
-        render_all_views(args.step, freecad_cmd=args.freecad_cmd)
+        render_all_views(args.step, freecad_cmd=args.freecad_cmd, overwrite=args.overwrite, deflection=args.deflection,
+                         view_workers=args.view_workers, freecad_gui=args.freecad_gui, verbose=args.verbose)